@@ -80,4 +80,19 @@ def ansatz_circuit_2(hop_gate_1, hop_gate_2, theta: Parameter):
     ansatz.swap(3, 4)
     ansatz.append(hop_gate_2.to_gate({theta: phi_3}), [0, 2])
     ansatz.append(hop_gate_2.to_gate({theta: phi_4}), [3, 4])
-    return ansatz
\ No newline at end of file
+    return ansatz
+
+
+# Brick-wall layers of hop gates for an arbitrary number of qubits, used for molecules beyond water.
+def hop_gate_layers_ansatz(
+        hop_gate: QuantumCircuit,
+        theta: Parameter,
+        num_qubits: int,
+        reps: int = 1,
+) -> QuantumCircuit:
+    ansatz = QuantumCircuit(num_qubits)
+    pairs = [(i, i + 1) for i in range(0, num_qubits - 1, 2)] + [(i, i + 1) for i in range(1, num_qubits - 1, 2)]
+    for rep in range(reps):
+        for idx, (q_0, q_1) in enumerate(pairs):
+            ansatz.append(hop_gate.to_gate({theta: Parameter(f"φ{rep * len(pairs) + idx + 1}")}), [q_0, q_1])
+    return ansatz
@@ -0,0 +1,263 @@
+"""
+This module contains the GenericMolecule class and the MoleculeScan geometry provider.
+A MoleculeScan describes a molecule whose geometry depends on one scan coordinate (a bond length or a bond angle),
+together with the basis and the active-space choices used to build its electronic structure problem.
+"""
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pyscf import gto
+from qiskit_nature.drivers import Molecule
+from qiskit_nature.drivers.second_quantization import PySCFDriver
+from qiskit_nature.problems.second_quantization import ElectronicStructureProblem
+from qiskit_nature.transformers.second_quantization.electronic import ActiveSpaceTransformer
+
+from entanglement_simulation.utils.classical_solver import CLASSICAL_SOLVER
+from entanglement_simulation.utils.experiment_data import DataPoint, ExperimentDataSet
+
+# A geometry is a list of (atom symbol, [x, y, z] in Angstrom).
+Geometry = List[Tuple[str, List[float]]]
+# Number of core orbitals per atom, by the last atomic number of each row of the periodic table.
+CORE_ORBITALS_BY_ROW = ((2, 0), (10, 1), (18, 5))
+ATOMIC_NUMBERS = {
+    "H": 1, "He": 2, "Li": 3, "Be": 4, "B": 5, "C": 6, "N": 7, "O": 8, "F": 9, "Ne": 10,
+    "Na": 11, "Mg": 12, "Al": 13, "Si": 14, "P": 15, "S": 16, "Cl": 17, "Ar": 18,
+}
+
+
+def num_core_orbitals(geometry: Geometry) -> int:
+    """Returns the number of core orbitals frozen by freeze_core, following the noble gas cores."""
+    num_core = 0
+    for symbol, _ in geometry:
+        if symbol not in ATOMIC_NUMBERS:
+            raise ValueError(f"freeze_core is not supported for {symbol}.")
+        num_core += next(core for last_z, core in CORE_ORBITALS_BY_ROW if ATOMIC_NUMBERS[symbol] <= last_z)
+    return num_core
+
+
+def excitation_bitstrings(num_orbitals: int, num_occupied: int, k: int) -> List[List[int]]:
+    """Returns the Hartree-Fock bitstring followed by its single excitations, k bitstrings in total.
+    Excitations from the highest occupied orbitals to the lowest virtual orbitals come first."""
+    hartree_fock = [1] * num_occupied + [0] * (num_orbitals - num_occupied)
+    bitstrings = [hartree_fock]
+    for occupied in reversed(range(num_occupied)):
+        for virtual in range(num_occupied, num_orbitals):
+            excitation = hartree_fock.copy()
+            excitation[occupied], excitation[virtual] = 0, 1
+            bitstrings.append(excitation)
+    if k > len(bitstrings):
+        raise ValueError(f"Only {len(bitstrings)} bitstrings are available, but k={k} was requested.")
+    return bitstrings[:k]
+
+
+class GenericMolecule:
+    def __init__(
+            self,
+            geometry: Geometry,
+            basis: str = "sto6g",
+            charge: int = 0,
+            multiplicity: int = 1,
+            active_space: Optional[Tuple[int, int]] = None,
+            active_orbitals: Optional[List[int]] = None,
+            freeze_core: bool = False,
+    ):
+        """
+        :param geometry: list of (atom symbol, [x, y, z]) in Angstrom.
+        :param basis: basis set passed to PySCF.
+        :param active_space: (number of active electrons, number of active molecular orbitals).
+        :param active_orbitals: indices of the active molecular orbitals; defaults to those around the Fermi level.
+        :param freeze_core: whether to freeze the core orbitals.
+        Both choices are applied through the orbitals_to_reduce of the forging solver; the classical reference is
+        solved in the same reduced space.
+        """
+        self.geometry = geometry
+        self.basis = basis
+        self.active_space = active_space
+        self.active_orbitals = active_orbitals
+        self.freeze_core = freeze_core
+        self.charge = charge
+        self.multiplicity = multiplicity
+        self.molecule = Molecule(geometry=geometry, charge=charge, multiplicity=multiplicity)
+        self._orbital_counts_cache = None
+        self._problem = None
+        self._classical_problem = None
+        self._classical_result = None
+
+    def __repr__(self):
+        return f"GenericMolecule(geometry={self.geometry}, basis={self.basis}, charge={self.charge}, " \
+               f"multiplicity={self.multiplicity}, active_space={self.active_space}, " \
+               f"active_orbitals={self.active_orbitals}, freeze_core={self.freeze_core})"
+
+    def __str__(self):
+        return self.__repr__()
+
+    def _to_problem(self) -> ElectronicStructureProblem:
+        # The forging solver reads the untransformed integrals, so orbitals are removed through orbitals_to_reduce.
+        driver = PySCFDriver.from_molecule(molecule=self.molecule, basis=self.basis)
+        return ElectronicStructureProblem(driver)
+
+    def _to_classical_problem(self) -> ElectronicStructureProblem:
+        """Returns the problem restricted to the orbitals kept by the forging solver."""
+        orbitals_to_reduce = self.orbitals_to_reduce
+        if not orbitals_to_reduce:
+            return self.problem
+        num_orbitals, num_occupied = self._orbital_counts()
+        kept_orbitals = [i for i in range(num_orbitals) if i not in orbitals_to_reduce]
+        num_electrons = 2 * sum(i < num_occupied for i in kept_orbitals)
+        driver = PySCFDriver.from_molecule(molecule=self.molecule, basis=self.basis)
+        active_space_transformer = ActiveSpaceTransformer(
+            num_electrons, len(kept_orbitals), active_orbitals=kept_orbitals
+        )
+        return ElectronicStructureProblem(driver, transformers=[active_space_transformer])
+
+    def _orbital_counts(self) -> Tuple[int, int]:
+        """Returns the number of spatial orbitals and of doubly occupied orbitals in the Hartree-Fock state.
+        The counts are read from the PySCF molecule, without running SCF or building second quantized operators."""
+        if self._orbital_counts_cache is None:
+            if self.multiplicity != 1:
+                raise ValueError("Entanglement forging only supports closed-shell molecules.")
+            mol = gto.M(
+                atom=[(symbol, coordinates) for symbol, coordinates in self.geometry],
+                basis=self.basis,
+                charge=self.charge,
+                spin=self.multiplicity - 1,
+                unit="Angstrom",
+            )
+            self._orbital_counts_cache = (mol.nao, mol.nelectron // 2)
+        return self._orbital_counts_cache
+
+    @property
+    def orbitals_to_reduce(self) -> List[int]:
+        """Orbitals removed by the frozen-core and active-space choices, as passed to the forging solver."""
+        if not self.freeze_core and self.active_space is None:
+            return []
+        num_orbitals, num_occupied = self._orbital_counts()
+        orbitals_to_reduce = set()
+        if self.freeze_core:
+            orbitals_to_reduce.update(range(num_core_orbitals(self.geometry)))
+        if self.active_space is not None:
+            num_electrons, num_molecular_orbitals = self.active_space
+            if num_electrons % 2:
+                raise ValueError("Entanglement forging only supports an even number of active electrons.")
+            first_active = num_occupied - num_electrons // 2
+            active_orbitals = (
+                self.active_orbitals
+                if self.active_orbitals is not None
+                else list(range(first_active, first_active + num_molecular_orbitals))
+            )
+            if len(active_orbitals) != num_molecular_orbitals or not set(active_orbitals) <= set(range(num_orbitals)):
+                raise ValueError(f"Invalid active orbitals {active_orbitals} for {num_orbitals} orbitals.")
+            orbitals_to_reduce.update(set(range(num_orbitals)) - set(active_orbitals))
+            kept_occupied = [i for i in range(num_occupied) if i not in orbitals_to_reduce]
+            if 2 * len(kept_occupied) != num_electrons:
+                raise ValueError(
+                    f"The active space holds {2 * len(kept_occupied)} electrons, but {num_electrons} were requested."
+                )
+        return sorted(orbitals_to_reduce)
+
+    def solve_classical_result(self):
+        if not self._classical_result:
+            self._classical_result = CLASSICAL_SOLVER.solve(self.classical_problem)
+
+    def forging_orbitals_to_reduce(self, orbitals_to_reduce: Iterable[int] = ()) -> List[int]:
+        """Returns the orbitals of the molecule to reduce together with additional ones (e.g. from hyperparameters)."""
+        return sorted(set(orbitals_to_reduce) | set(self.orbitals_to_reduce))
+
+    def num_kept_orbitals(self, orbitals_to_reduce: Iterable[int] = ()) -> int:
+        """Returns the number of orbitals left to the forging solver, i.e. the length of its bitstrings."""
+        num_orbitals, _ = self._orbital_counts()
+        return num_orbitals - len(self.forging_orbitals_to_reduce(orbitals_to_reduce))
+
+    def bitstrings(self, k: int, orbitals_to_reduce: Iterable[int] = ()) -> List[List[int]]:
+        """Returns k bitstrings over the orbitals kept by the forging solver, starting from Hartree-Fock.
+        `orbitals_to_reduce` are removed on top of the frozen-core and active-space choices of the molecule."""
+        _, num_occupied = self._orbital_counts()
+        all_orbitals_to_reduce = self.forging_orbitals_to_reduce(orbitals_to_reduce)
+        return excitation_bitstrings(
+            self.num_kept_orbitals(orbitals_to_reduce),
+            num_occupied - sum(i < num_occupied for i in all_orbitals_to_reduce),
+            k,
+        )
+
+    @property
+    def problem(self) -> ElectronicStructureProblem:
+        if self._problem is None:
+            self._problem = self._to_problem()
+        return self._problem
+
+    @property
+    def forging_problem(self) -> ElectronicStructureProblem:
+        """The problem passed to the forging solver, which reads the driver result from grouped_property."""
+        if self.problem.grouped_property is None:
+            # The driver only runs once the second quantized operators are built.
+            self.problem.second_q_ops()
+        return self.problem
+
+    @property
+    def classical_problem(self) -> ElectronicStructureProblem:
+        if self._classical_problem is None:
+            self._classical_problem = self._to_classical_problem()
+        return self._classical_problem
+
+    @property
+    def classical_result(self):
+        if not self._classical_result:
+            self.solve_classical_result()
+        return self._classical_result
+
+    @property
+    def hartree_fock_energy(self):
+        return self.classical_result.hartree_fock_energy
+
+    @property
+    def classical_energy(self):
+        return float(np.real(self.classical_result.total_energies[0]))
+
+
+@dataclass
+class MoleculeScan:
+    """
+    Provides the molecules along a one-dimensional geometry scan.
+    `geometry` maps a scan coordinate to a geometry and `coordinates` maps a number of points to the scan coordinates.
+    Both should be module-level functions (or partials of them) so that a scan can be sent to worker processes.
+    """
+    name: str
+    geometry: Callable[[float], Geometry]
+    coordinates: Callable[[int], np.ndarray]
+    basis: str = "sto6g"
+    charge: int = 0
+    multiplicity: int = 1
+    active_space: Optional[Tuple[int, int]] = None
+    active_orbitals: Optional[List[int]] = None
+    freeze_core: bool = False
+
+    def molecule(self, coordinate: float) -> GenericMolecule:
+        return GenericMolecule(
+            self.geometry(coordinate),
+            basis=self.basis,
+            charge=self.charge,
+            multiplicity=self.multiplicity,
+            active_space=self.active_space,
+            active_orbitals=self.active_orbitals,
+            freeze_core=self.freeze_core,
+        )
+
+    def molecules(self, n_points: int) -> Iterator[Tuple[float, GenericMolecule]]:
+        for coordinate in self.coordinates(n_points):
+            yield coordinate, self.molecule(coordinate)
+
+    def classical_data(self, n_points: int = 50) -> ExperimentDataSet:
+        """Solves the classical problem along the scan."""
+        classical_data = ExperimentDataSet()
+        for coordinate, molecule in self.molecules(n_points):
+            classical_energy = molecule.classical_energy
+            print("Classical energy = ", classical_energy)
+            classical_data.add_data_point(
+                DataPoint(
+                    radius=coordinate,
+                    hartree_fock_energy=molecule.hartree_fock_energy,
+                    classical_energy=classical_energy,
+                )
+            )
+        return classical_data
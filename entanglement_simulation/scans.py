@@ -0,0 +1,59 @@
+"""
+This module contains the molecule scans available to the entanglement forging pipeline.
+Besides the water cases of the paper, it provides larger systems to benchmark the forging throughput and scaling.
+"""
+from typing import Union
+
+import numpy as np
+
+from entanglement_simulation.molecule import Geometry, MoleculeScan
+from entanglement_simulation.water_molecule import WATER_SCANS
+
+NH3_BOND_ANGLE_IN_DEG = 106.67  # H-N-H bond angle.
+# Polar angle of the N-H bonds with respect to the C3 axis, such that all H-N-H angles equal NH3_BOND_ANGLE_IN_DEG.
+NH3_POLAR_ANGLE = np.arcsin(np.sqrt((1 - np.cos(np.pi / 180 * NH3_BOND_ANGLE_IN_DEG)) / 1.5))
+
+
+def nh3_radii(n_points: int = 50) -> np.ndarray:
+    return np.linspace(0.7, 2.5, n_points)
+
+
+def n2_radii(n_points: int = 50) -> np.ndarray:
+    return np.linspace(0.8, 2.5, n_points)
+
+
+def nh3_geometry(radius: float) -> Geometry:
+    """NH3 with all three N-H bonds stretched symmetrically."""
+    return [("N", [0.0, 0.0, 0.0])] + [
+        (
+            "H",
+            [
+                radius * np.sin(NH3_POLAR_ANGLE) * np.cos(2 * np.pi * i / 3),
+                radius * np.sin(NH3_POLAR_ANGLE) * np.sin(2 * np.pi * i / 3),
+                -radius * np.cos(NH3_POLAR_ANGLE),
+            ],
+        )
+        for i in range(3)
+    ]
+
+
+def n2_geometry(radius: float) -> Geometry:
+    return [("N", [0.0, 0.0, 0.0]), ("N", [0.0, 0.0, radius])]
+
+
+MOLECULE_SCANS = {
+    **WATER_SCANS,
+    # 7 spatial orbitals and 8 electrons after freezing the N 1s orbital.
+    "nh3": MoleculeScan(name="nh3", geometry=nh3_geometry, coordinates=nh3_radii, freeze_core=True),
+    # 8 spatial orbitals and 10 electrons after freezing both N 1s orbitals.
+    "n2": MoleculeScan(name="n2", geometry=n2_geometry, coordinates=n2_radii, freeze_core=True),
+}
+
+
+def get_molecule_scan(case: Union[str, MoleculeScan]) -> MoleculeScan:
+    """Returns the scan registered under `case`, or `case` itself if it is already a scan."""
+    if isinstance(case, MoleculeScan):
+        return case
+    if case not in MOLECULE_SCANS:
+        raise ValueError(f"Case must be one of {list(MOLECULE_SCANS)} or a MoleculeScan.")
+    return MOLECULE_SCANS[case]
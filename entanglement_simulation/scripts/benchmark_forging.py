@@ -0,0 +1,71 @@
+"""
+This script benchmarks the throughput and scaling of entanglement forging on the registered molecule scans.
+Each benchmark runs through run_one_entangled_forging_experiment, so it measures the same path as the experiments and
+reuses their cached results.
+"""
+import time
+from typing import Optional, Union
+
+from qiskit.circuit import Parameter
+
+from entanglement_simulation import EXPERIMENT_DIR
+from entanglement_simulation.circuits import hop_gate_2, hop_gate_layers_ansatz
+from entanglement_simulation.molecule import MoleculeScan
+from entanglement_simulation.scans import get_molecule_scan
+from entanglement_simulation.scripts.entanglement_forge import run_one_entangled_forging_experiment
+from entanglement_simulation.utils.experiment_data import HyperParameters
+
+BENCHMARK_DIR = EXPERIMENT_DIR / "benchmarks"
+
+
+def benchmark_molecule_scan(
+        case: Union[str, MoleculeScan], k: int = 3, n_points: int = 3, hyperparameters: Optional[HyperParameters] = None
+) -> dict:
+    """Runs forged VQE along a scan and returns its timing.
+    Without hyperparameters, only the frozen-core and active-space choices of the scan reduce the orbitals."""
+    molecule_scan = get_molecule_scan(case)
+    # The number of kept orbitals does not depend on the geometry, so the first molecule of the scan is representative.
+    _, molecule = next(molecule_scan.molecules(n_points))
+    orbitals_to_reduce = hyperparameters.orbitals_to_reduce if hyperparameters is not None else []
+    num_qubits = molecule.num_kept_orbitals(orbitals_to_reduce)
+    theta = Parameter("θ")
+    ansatz = hop_gate_layers_ansatz(hop_gate_2(theta), theta, num_qubits)
+    if hyperparameters is None:
+        hyperparameters = HyperParameters(
+            k=k, orbitals_to_reduce=[], initial_thetas=[0.0] * ansatz.num_parameters
+        )
+    bitstrings = molecule.bitstrings(hyperparameters.k, hyperparameters.orbitals_to_reduce)
+
+    target_dir = BENCHMARK_DIR / f"{molecule_scan.name}_k{hyperparameters.k}"
+    target_dir.mkdir(exist_ok=True, parents=True)
+    existing_result_files = set(target_dir.glob("*.json"))
+    start = time.perf_counter()
+    result = run_one_entangled_forging_experiment(
+        ansatz, hyperparameters, reduced_bitstrings=bitstrings, target_dir=target_dir, case=molecule_scan,
+        n_points=n_points,
+    )
+    seconds = time.perf_counter() - start
+    return {
+        # A cached result has been loaded rather than computed, so its timing does not measure the forging.
+        "cached": set(target_dir.glob("*.json")) == existing_result_files,
+        "name": molecule_scan.name,
+        "k": hyperparameters.k,
+        "num_qubits": num_qubits,
+        "n_points": result.number_data_points,
+        "seconds": seconds,
+        "geometries_per_hour": 3600 * result.number_data_points / seconds,
+        "mean_square_error_to_classical": result.mean_square_error_to_classical,
+    }
+
+
+if __name__ == "__main__":
+    for case in ["b", "nh3", "n2"]:
+        # The forging solver needs at least two bitstrings.
+        for k in [2, 3, 6]:
+            benchmark = benchmark_molecule_scan(case, k=k)
+            print(
+                f"{benchmark['name']} k={k}: {benchmark['num_qubits']} qubits per forged half; "
+                f"{benchmark['geometries_per_hour']: .1f} geometries per hour; "
+                f"error to classical: {benchmark['mean_square_error_to_classical']: .5f} Ha"
+                f"{' (cached)' if benchmark['cached'] else ''}"
+            )
@@ -2,7 +2,7 @@
 This script runs the entanglement forging experiment.
 """
 from pathlib import Path
-from typing import Union, Dict
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
 
@@ -15,9 +15,11 @@ from entanglement_forging import EntanglementForgedConfig
 from entanglement_simulation import EXPERIMENT_DIR
 from entanglement_simulation.circuits import hop_gate_2, ansatz_circuit_1
 from entanglement_simulation.data.constants import BITSTRINGS
+from entanglement_simulation.molecule import MoleculeScan
+from entanglement_simulation.scans import get_molecule_scan
 from entanglement_simulation.utils.classical_solver import CONVERTER
 from entanglement_simulation.utils.experiment_data import DataPoint, ExperimentDataSet, HyperParameters
-from entanglement_simulation.water_molecule import radii, WaterMolecule, thetas
+from entanglement_simulation.utils.scheduler import MemoryBoundedScheduler, Task
 
 
 def reduce_bitstrings(bitstrings, orbitals_to_reduce) -> list:
@@ -27,46 +29,49 @@ def reduce_bitstrings(bitstrings, orbitals_to_reduce) -> list:
 
 def collect_exisiting_hyperparams_to_results(
         experiment_path: Union[Path, str]
-) -> Dict[HyperParameters, ExperimentDataSet]:
-    """Collects all existing results from a given experiment path."""
+) -> Dict[Tuple[HyperParameters, Optional[str], int], ExperimentDataSet]:
+    """Collects all existing results from a given experiment path,
+    keyed by their hyperparameters, scan name and number of data points."""
     experiment_path = Path(experiment_path)
     exisiting_results = [ExperimentDataSet.from_json(f) for f in list(experiment_path.glob("*.json"))]
-    return {result.hyperparameters: result for result in exisiting_results}
+    return {
+        (result.hyperparameters, result.scan_name, result.number_data_points): result
+        for result in exisiting_results
+    }
 
 
 def run_one_entangled_forging_experiment(
         ansatz: QuantumCircuit, hyperparameters: HyperParameters, reduced_bitstrings: list, target_dir: Path,
-        case: str = "b"
+        case: Union[str, MoleculeScan] = "b", n_points: int = 10
 ) -> ExperimentDataSet:
-    """Runs one entangled forging experiment with one set of hyperparameters."""
-
-    if case not in ["a", "b", "c"]:
-        raise ValueError("Case must be 'a', 'b', or 'c'.")
-    if case in {"a", "b"}:
-        params = radii(10)
-    elif case == "c":
-        params = thetas(10)
+    """Runs one entangled forging experiment with one set of hyperparameters.
+    `case` is either a key of MOLECULE_SCANS (e.g. 'a', 'b', 'c', 'nh3') or a MoleculeScan."""
+    molecule_scan = get_molecule_scan(case)
 
     print(hyperparameters)
     # Check if the experiment has already been run.
     hyperparam_to_exisiting_results = collect_exisiting_hyperparams_to_results(target_dir)
-    if hyperparameters in hyperparam_to_exisiting_results:
-        exisiting_result = hyperparam_to_exisiting_results[hyperparameters]
+    # Results saved before the scan name was recorded have no scan name; they are kept per case directory.
+    cache_keys = [(hyperparameters, molecule_scan.name, n_points), (hyperparameters, None, n_points)]
+    exisiting_key = next((key for key in cache_keys if key in hyperparam_to_exisiting_results), None)
+    if exisiting_key is not None:
+        exisiting_result = hyperparam_to_exisiting_results[exisiting_key]
         for data_point in exisiting_result.data_points:
             print(f"Radius: {data_point.radius: .3f}; Ground State Energy: {data_point.forged_vqe_energy: .5f}")
         return exisiting_result
 
     # Run the experiment.
-    experiment_data_set = ExperimentDataSet(hyperparameters=hyperparameters)
-    for p in params:
-        # Prepare the water molecule.
-        if case == "a":
-            water = WaterMolecule(radius_1=p, radius_2=p)
-        elif case == "b":
-            water = WaterMolecule(radius_2=p)
-        elif case == "c":
-            water = WaterMolecule(thetas_in_deg=p)
-        water.solve_classical_result()
+    experiment_data_set = ExperimentDataSet(hyperparameters=hyperparameters, scan_name=molecule_scan.name)
+    for p, molecule in molecule_scan.molecules(n_points):
+        # The frozen-core and active-space choices of the molecule are applied on top of the reduced orbitals.
+        orbitals_to_reduce = molecule.forging_orbitals_to_reduce(hyperparameters.orbitals_to_reduce)
+        num_kept_orbitals = molecule.num_kept_orbitals(hyperparameters.orbitals_to_reduce)
+        if len(reduced_bitstrings[0]) != num_kept_orbitals:
+            raise ValueError(
+                f"Bitstrings have {len(reduced_bitstrings[0])} orbitals, but {num_kept_orbitals} orbitals are left "
+                f"after reducing orbitals {orbitals_to_reduce} of {molecule_scan.name}."
+            )
+        molecule.solve_classical_result()
 
         # Run the entangled forging experiment.
         backend = Aer.get_backend("statevector_simulator")
@@ -82,16 +87,16 @@ def run_one_entangled_forging_experiment(
             ansatz=ansatz,
             bitstrings_u=reduced_bitstrings[:hyperparameters.k],
             config=config,
-            orbitals_to_reduce=hyperparameters.orbitals_to_reduce
+            orbitals_to_reduce=orbitals_to_reduce
         )
-        res = calc.solve(water.problem)
+        res = calc.solve(molecule.forging_problem)
         print(f"Radius: {p: .3f}; Ground State Energy: {res.ground_state_energy: .5f}")
 
         # Prepare data point and add it to the experiment data set.
         data_point = DataPoint(
             radius=p,
-            hartree_fock_energy=water.hartree_fock_energy,
-            classical_energy=water.classical_energy,
+            hartree_fock_energy=molecule.hartree_fock_energy,
+            classical_energy=molecule.classical_energy,
             forged_vqe_energy=res.ground_state_energy,
             schmidts_coefficients=res.schmidts_value.tolist()
         )
@@ -138,14 +143,26 @@ if __name__ == "__main__":
     hop_gate_1 = hop_gate_2(theta)
     ansatz = ansatz_circuit_1(hop_gate_1, theta)
 
-    # Run experiments
-    experiment_results = []
-    for idx, hyperparameters in enumerate(hyperparameters_sets):
-        print(f"Experiment {idx + 1}/{len(hyperparameters_sets)}")
-        experiment_result = run_one_entangled_forging_experiment(
-            ansatz, hyperparameters, reduced_bitstrings=reduced_bitstrings, target_dir=experiment_dir
+    # Run experiments in parallel within the memory budget.
+    scheduler = MemoryBoundedScheduler()
+    tasks = [
+        Task(
+            run_one_entangled_forging_experiment,
+            args=(ansatz, hyperparameters),
+            kwargs={"reduced_bitstrings": reduced_bitstrings, "target_dir": experiment_dir},
+            name=f"Experiment {idx + 1}/{len(hyperparameters_sets)}",
         )
-        experiment_results.append(experiment_result)
+        for idx, hyperparameters in enumerate(hyperparameters_sets)
+    ]
+    task_results = scheduler.run(tasks)
+    for task_result in task_results:
+        print(f"{task_result.name}: peak RSS {task_result.peak_rss / 2 ** 20: .1f} MiB; {task_result.threads} threads")
+        if not task_result.succeeded:
+            print(task_result.error)
+    experiment_results = [task_result.result for task_result in task_results if task_result.succeeded]
+    if not experiment_results:
+        task_errors = "\n".join(f"{task_result.name}: {task_result.error}" for task_result in task_results)
+        raise SystemExit(f"All {len(task_results)} experiments failed:\n{task_errors}")
 
     # Save the best results
     final_result_dir = experiment_dir / "best_fit/"
@@ -1,7 +1,14 @@
 """
-This script is used to generate plots Fig 3B and Fig 4B for the paper.
+This script is used to generate plots Fig 3 and Fig 4 for the paper.
+All experiment directories are rendered in parallel; a directory is only re-rendered when its input data changed.
 """
+import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
 import matplotlib.pyplot as plt
 
 from entanglement_simulation.utils.experiment_data import ExperimentDataSet
@@ -31,20 +38,25 @@ PLOT_CONFIG = {
         "y_lim": [(-75.80, -75.45), (0.1, 500), (1e-2, 2)],
     }
 }
+PLOT_HASH_FILE_NAME = ".input_hashes.json"
+
+
+def load_water_data(case: str) -> ExperimentDataSet:
+    """Loads the classical water data of a case, computing and saving it first if it does not exist yet."""
+    water_data_file = PLOT_CONFIG[case]["water_data"]
+    if not water_data_file.exists():
+        create_water_data(case[-1]).to_json(water_data_file)
+    return ExperimentDataSet.from_json(water_data_file)
 
 
 def plot_directory(experiment_dir: Path):
     case, config = [(k, config) for k, config in PLOT_CONFIG.items() if k in experiment_dir.name][0]
-    water_data = (
-        ExperimentDataSet.from_json(PLOT_CONFIG[case]["water_data"])
-        if PLOT_CONFIG[case]["water_data"].exists()
-        else create_water_data()
-    )
+    water_data = load_water_data(case)
     plot_dir = experiment_dir / "plots/"
     plot_dir.mkdir(exist_ok=True)
     k3_data = ExperimentDataSet.from_json(experiment_dir / "best_fit/k3.json")
     k6_data = ExperimentDataSet.from_json(experiment_dir / "best_fit/k6.json")
-    fig_3 = plt.figure(0, figsize=(6, 7))
+    fig_3 = plt.figure(figsize=(6, 7))
     fig_3.suptitle(
         f"VQE energies [c0: {k3_data.hyperparameters.spsa_c0: .3f}; c1: {k3_data.hyperparameters.spsa_c1: .3f}]"
     )
@@ -65,7 +77,7 @@ def plot_directory(experiment_dir: Path):
     fig_3_subplots[1].set_yscale("log")
     fig_3.tight_layout()
 
-    fig_4 = plt.figure(1, figsize=(6, 4))
+    fig_4 = plt.figure(figsize=(6, 4))
     fig_4.suptitle(
         f"Schmidt coefficients [c0: {k3_data.hyperparameters.spsa_c0: .3f}; c1: {k3_data.hyperparameters.spsa_c1: .3f}]"
     )
@@ -83,9 +95,80 @@ def plot_directory(experiment_dir: Path):
     return {f"fig_3{case[-1]}": fig_3, f"fig_4{case[-1]}": fig_4}
 
 
-if __name__ == "__main__":
-    experiment_dir = EXPERIMENT_DIR / "case_c_reduced_orbitals_0_3_k3"
+def _input_files(experiment_dir: Path) -> list:
+    """Returns the data files a directory's plots are drawn from."""
+    case = [k for k in PLOT_CONFIG if k in experiment_dir.name][0]
+    return [experiment_dir / "best_fit/k3.json", experiment_dir / "best_fit/k6.json", PLOT_CONFIG[case]["water_data"]]
+
+
+def input_hashes(experiment_dir: Path) -> Dict[str, str]:
+    """Returns the sha256 content hash of every input file of a directory."""
+    return {f.name: hashlib.sha256(f.read_bytes()).hexdigest() for f in _input_files(experiment_dir)}
+
+
+def is_plot_up_to_date(experiment_dir: Path) -> bool:
+    """Checks whether the plots exist and were rendered from the current input data."""
+    plot_dir = experiment_dir / "plots/"
+    hash_file = plot_dir / PLOT_HASH_FILE_NAME
+    if not hash_file.exists() or not all(f.exists() for f in _input_files(experiment_dir)):
+        return False
+    with open(hash_file, "r") as f:
+        cached_hashes = json.load(f)
+    return (
+        cached_hashes.get("inputs") == input_hashes(experiment_dir)
+        and all((plot_dir / f).exists() for f in cached_hashes.get("plots", []))
+    )
+
+
+def render_directory(experiment_dir: Path, force: bool = False) -> bool:
+    """Renders and saves the plots of one directory. Returns False if the cached plots were reused."""
+    experiment_dir = Path(experiment_dir)
+    if not force and is_plot_up_to_date(experiment_dir):
+        return False
+    # Workers never display figures, so the headless backend is sufficient and safe to use in subprocesses.
+    plt.switch_backend("Agg")
     figures = plot_directory(experiment_dir)
     for key, fig in figures.items():
-        figures[key].show()
-        figures[key].savefig(experiment_dir / f"plots/{key}.png")
+        fig.savefig(experiment_dir / f"plots/{key}.png")
+        plt.close(fig)
+    with open(experiment_dir / "plots" / PLOT_HASH_FILE_NAME, "w") as f:
+        json.dump(
+            {"inputs": input_hashes(experiment_dir), "plots": [f"{key}.png" for key in figures]}, f, indent=2
+        )
+    return True
+
+
+def plot_experiment_directories(
+        experiment_dirs: Optional[Iterable[Path]] = None, max_workers: Optional[int] = None, force: bool = False
+) -> Dict[Path, Union[bool, Exception]]:
+    """Renders the plots of all experiment directories in parallel.
+    Returns a mapping from each directory to whether it has been re-rendered, or to the exception it failed with."""
+    if experiment_dirs is None:
+        experiment_dirs = sorted(
+            d for d in EXPERIMENT_DIR.glob("*")
+            if d.is_dir() and any(case in d.name for case in PLOT_CONFIG)
+            and (d / "best_fit/k3.json").exists() and (d / "best_fit/k6.json").exists()
+        )
+    rendered = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(render_directory, d, force=force): d for d in experiment_dirs}
+        for future in as_completed(futures):
+            # A failing directory is reported without losing the results of the others.
+            try:
+                rendered[futures[future]] = future.result()
+            except Exception as e:
+                rendered[futures[future]] = e
+    return {d: rendered[d] for d in futures.values()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the plots of all experiment directories.")
+    parser.add_argument(
+        "--force", action="store_true", help="re-render all plots, even if their input data has not changed"
+    )
+    args = parser.parse_args()
+    for experiment_dir, rendered in plot_experiment_directories(force=args.force).items():
+        if isinstance(rendered, Exception):
+            print(f"{experiment_dir.name}: failed ({type(rendered).__name__}: {rendered})")
+        else:
+            print(f"{experiment_dir.name}: {'rendered' if rendered else 'up to date'}")
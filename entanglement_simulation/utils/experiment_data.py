@@ -2,6 +2,8 @@
 This module contains the data classes used to store the results of the experiments.
 """
 import json
+import os
+import tempfile
 from dataclasses import dataclass, asdict, field
 import numpy as np
 from pathlib import Path
@@ -59,6 +61,7 @@ class HyperParameters:
 class ExperimentDataSet:
     data_points: list[DataPoint] = field(default_factory=list)
     hyperparameters: Optional[HyperParameters] = None
+    scan_name: Optional[str] = None
 
     def add_data_point(self, data_point: DataPoint):
         self.data_points.append(data_point)
@@ -67,8 +70,15 @@ class ExperimentDataSet:
         return asdict(self)
 
     def to_json(self, file_path: Union[Path, str]):
-        with open(file_path, "w") as f:
+        # Write to a temporary file first, so that parallel readers never see a partially written file.
+        file_path = Path(file_path)
+        with tempfile.NamedTemporaryFile("w", dir=file_path.parent, suffix=".tmp", delete=False) as f:
             json.dump(self.to_dict(), f)
+        # Temporary files are owner-only; give the result the permissions of a regularly created file.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(f.name, 0o666 & ~umask)
+        os.replace(f.name, file_path)
 
     @classmethod
     def from_json(cls, file_path: Union[Path, str]):
@@ -82,12 +92,14 @@ class ExperimentDataSet:
                 hyperparameters=HyperParameters.from_dict(
                     data_dict["hyperparameters"]
                 ),
+                scan_name=data_dict.get("scan_name"),
             )
             if "hyperparameters" in data_dict and data_dict["hyperparameters"] is not None
             else cls(
                 data_points=[
                     DataPoint.from_dict(dp) for dp in data_dict["data_points"]
-                ]
+                ],
+                scan_name=data_dict.get("scan_name"),
             )
         )
 
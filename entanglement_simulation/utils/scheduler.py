@@ -0,0 +1,254 @@
+"""
+This module contains a memory-bounded scheduler to run experiments in parallel worker processes.
+The peak RSS of each task is measured while it runs. Every running task reserves the expected peak RSS of a task, and
+new tasks are only started when the memory budget has room for one more reservation. Tasks exceeding the per-task
+limit, or killed by the OOM killer, are restarted with fewer threads.
+"""
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+import psutil
+
+# Environment variables limiting the threads of OpenMP (Qiskit Aer, PySCF) and of the BLAS libraries used by numpy.
+THREAD_ENV_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+@dataclass
+class Task:
+    fn: Callable
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    name: Optional[str] = None
+
+
+@dataclass
+class TaskResult:
+    name: str
+    result: Any = None
+    error: Optional[str] = None
+    peak_rss: int = 0
+    threads: int = 1
+    attempts: int = 0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _RunningTask:
+    index: int
+    process: multiprocessing.Process
+    connection: Any
+    threads: int
+    peak_rss: int = 0
+    current_rss: int = 0
+    message: Optional[tuple] = None
+
+
+def _run_task(connection, fn: Callable, args: tuple, kwargs: dict):
+    try:
+        connection.send(("ok", fn(*args, **kwargs)))
+    except BaseException:
+        connection.send(("error", traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+def _process_rss(pid: int) -> int:
+    """Returns the RSS of a process and all of its children in bytes."""
+    try:
+        process = psutil.Process(pid)
+        processes = [process] + process.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return 0
+    rss = 0
+    for p in processes:
+        try:
+            rss += p.memory_info().rss
+        except psutil.NoSuchProcess:
+            pass
+    return rss
+
+
+@contextmanager
+def _thread_limit(threads: int):
+    """Sets the thread limits inherited by a worker process started within this context."""
+    previous = {key: os.environ.get(key) for key in THREAD_ENV_VARIABLES}
+    os.environ.update({key: str(threads) for key in THREAD_ENV_VARIABLES})
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key)
+            else:
+                os.environ[key] = value
+
+
+class MemoryBoundedScheduler:
+    def __init__(
+            self,
+            memory_budget: Optional[int] = None,
+            per_task_limit: Optional[int] = None,
+            max_workers: Optional[int] = None,
+            threads_per_task: Optional[int] = None,
+            safety_factor: float = 1.2,
+            poll_interval: float = 0.2,
+    ):
+        """
+        :param memory_budget: total RSS in bytes all running tasks may use; defaults to 80% of the available memory.
+        :param per_task_limit: RSS in bytes above which a task is restarted with fewer threads; defaults to an equal
+        share of the budget per worker. Until a task has finished, every running task reserves this limit.
+        :param max_workers: maximum number of tasks running at the same time; defaults to half of the CPUs.
+        :param threads_per_task: threads a task starts with; defaults to splitting the CPUs between the workers.
+        :param safety_factor: margin applied to the largest observed peak RSS when estimating the size of a new task.
+        :param poll_interval: seconds between two RSS measurements.
+        """
+        cpu_count = os.cpu_count() or 1
+        self.memory_budget = memory_budget or int(0.8 * psutil.virtual_memory().available)
+        self.max_workers = max_workers or max(1, cpu_count // 2)
+        self.per_task_limit = min(per_task_limit or self.memory_budget // self.max_workers, self.memory_budget)
+        self.threads_per_task = threads_per_task or max(1, cpu_count // self.max_workers)
+        self.safety_factor = safety_factor
+        self.poll_interval = poll_interval
+        self.concurrency = self.max_workers
+        self._context = multiprocessing.get_context("spawn")
+        self._observed_peaks: List[int] = []
+
+    def __repr__(self):
+        return f"MemoryBoundedScheduler(memory_budget={self.memory_budget}, per_task_limit={self.per_task_limit}, " \
+               f"max_workers={self.max_workers}, threads_per_task={self.threads_per_task})"
+
+    def __str__(self):
+        return self.__repr__()
+
+    def expected_task_rss(self, running: List[_RunningTask]) -> float:
+        """Estimates the peak RSS of the next task from the peaks observed so far.
+        Until a task has finished, its final peak is unknown and the per-task limit is assumed."""
+        if not self._observed_peaks:
+            return self.per_task_limit
+        peaks = self._observed_peaks + [r.peak_rss for r in running]
+        return min(self.safety_factor * max(peaks), self.per_task_limit)
+
+    def reserved_rss(self, running: List[_RunningTask]) -> float:
+        """Memory reserved by the running tasks: a task that has not reached the expected peak yet still reserves it."""
+        expected = self.expected_task_rss(running)
+        return sum(max(r.current_rss, expected) for r in running)
+
+    def _has_headroom(self, running: List[_RunningTask]) -> bool:
+        expected = self.expected_task_rss(running)
+        return (
+            self.reserved_rss(running) + expected <= self.memory_budget
+            and expected <= psutil.virtual_memory().available
+        )
+
+    def _start(self, task: Task, index: int, threads: int) -> _RunningTask:
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(target=_run_task, args=(sender, task.fn, task.args, task.kwargs))
+        with _thread_limit(threads):
+            process.start()
+        sender.close()
+        return _RunningTask(index=index, process=process, connection=receiver, threads=threads)
+
+    @staticmethod
+    def _stop(running_task: _RunningTask):
+        try:
+            for child in psutil.Process(running_task.process.pid).children(recursive=True):
+                child.kill()
+        except psutil.NoSuchProcess:
+            pass
+        running_task.process.kill()
+        running_task.process.join()
+        running_task.connection.close()
+
+    def run(self, tasks: List[Task]) -> List[TaskResult]:
+        """Runs all tasks and returns their results in the order of the tasks.
+        A failing task does not stop the others."""
+        results = [
+            TaskResult(name=task.name or f"task_{idx}", threads=self.threads_per_task)
+            for idx, task in enumerate(tasks)
+        ]
+        pending = list(range(len(tasks)))
+        running: List[_RunningTask] = []
+        while pending or running:
+            # Start new tasks while there is room in the memory budget. At least one task always runs.
+            while pending and len(running) < self.concurrency and (not running or self._has_headroom(running)):
+                index = pending.pop(0)
+                results[index].attempts += 1
+                running.append(self._start(tasks[index], index, results[index].threads))
+
+            time.sleep(self.poll_interval)
+            for running_task in running:
+                running_task.current_rss = _process_rss(running_task.process.pid)
+                running_task.peak_rss = max(running_task.peak_rss, running_task.current_rss)
+                results[running_task.index].peak_rss = running_task.peak_rss
+                # Read the result before joining, otherwise a large result blocks the worker on the pipe.
+                if running_task.message is None and running_task.connection.poll():
+                    try:
+                        running_task.message = running_task.connection.recv()
+                    except EOFError:
+                        pass
+
+            for running_task in list(running):
+                result = results[running_task.index]
+                # A task that has reported its result is kept, even if it went over the limit while finishing.
+                if running_task.message is not None or not running_task.process.is_alive():
+                    running.remove(running_task)
+                    if running_task.message is None and running_task.connection.poll():
+                        try:
+                            running_task.message = running_task.connection.recv()
+                        except EOFError:
+                            pass
+                    running_task.process.join()
+                    running_task.connection.close()
+                    self._finish(result, running_task, pending, running)
+                elif running_task.peak_rss > self.per_task_limit:
+                    running.remove(running_task)
+                    self._stop(running_task)
+                    self._retry_with_fewer_threads(result, pending, running_task.index, "exceeded the per-task limit")
+
+            # The running tasks together outgrew the budget: stop the newest one and lower the concurrency.
+            if len(running) > 1 and sum(r.current_rss for r in running) > self.memory_budget:
+                newest = running.pop()
+                self._stop(newest)
+                pending.insert(0, newest.index)
+                self.concurrency = max(1, len(running))
+                print(f"{results[newest.index].name} postponed; concurrency lowered to {self.concurrency}")
+        return results
+
+    def _finish(self, result: TaskResult, running_task: _RunningTask, pending: List[int], running: List[_RunningTask]):
+        if running_task.message is None:
+            exitcode = running_task.process.exitcode
+            if exitcode == -signal.SIGKILL:
+                # Killed without reporting, most likely by the OOM killer.
+                self._retry_with_fewer_threads(result, pending, running_task.index, "was killed")
+            else:
+                result.error = f"{result.name} died with exit code {exitcode}."
+                print(result.error)
+            return
+        status, payload = running_task.message
+        if status == "ok":
+            result.result = payload
+        else:
+            result.error = payload
+        self._observed_peaks.append(running_task.peak_rss)
+        # Only allow one more concurrent task if the reserved memory leaves room for it.
+        if self.concurrency < self.max_workers and self._has_headroom(running):
+            self.concurrency += 1
+
+    def _retry_with_fewer_threads(self, result: TaskResult, pending: List[int], index: int, reason: str):
+        if result.threads == 1:
+            result.error = f"MemoryError: {result.name} {reason} with a single thread " \
+                           f"(peak RSS: {result.peak_rss / 2 ** 20: .1f} MiB)."
+            print(result.error)
+            return
+        result.threads = max(1, result.threads // 2)
+        pending.insert(0, index)
+        print(f"{result.name} {reason}; restarting with {result.threads} threads")
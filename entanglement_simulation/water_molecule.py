@@ -1,14 +1,12 @@
 """
-This module contains the WaterMolecule class, which is used to create a water molecule with a given radius and bond angle.
+This module contains the WaterMolecule class, which is used to create a water molecule with a given radius and
+bond angle, and the water geometry scans of case (a), (b) and (c).
 This script is used to generate the file: entanglement_simulation/data/water_data.json
 """
 import numpy as np
-from qiskit_nature.drivers import Molecule
-from qiskit_nature.drivers.second_quantization import PySCFDriver
-from qiskit_nature.problems.second_quantization import ElectronicStructureProblem
 
-from entanglement_simulation.utils.classical_solver import CLASSICAL_SOLVER
-from entanglement_simulation.utils.experiment_data import DataPoint, ExperimentDataSet
+from entanglement_simulation.molecule import GenericMolecule, Geometry, MoleculeScan
+from entanglement_simulation.utils.experiment_data import ExperimentDataSet
 
 from entanglement_simulation import DATA_DIR
 
@@ -26,37 +24,44 @@ def thetas(n_points: int = 50) -> np.ndarray:
     return np.linspace(40.0, 180.0, n_points)
 
 
-class WaterMolecule:
+def water_geometry(radius_1: float = R_1, radius_2: float = R_2, thetas_in_deg: float = THETAS_IN_DEG) -> Geometry:
+    return [
+        ("O", [0.0, 0.0, 0.0]),
+        ("H", [radius_1, 0.0, 0.0]),
+        ("H", [radius_2 * np.cos(np.pi / 180 * thetas_in_deg), radius_2 * np.sin(np.pi / 180 * thetas_in_deg), 0.0]),
+    ]
+
+
+def symmetric_stretch_geometry(radius: float) -> Geometry:
+    return water_geometry(radius_1=radius, radius_2=radius)
+
+
+def single_stretch_geometry(radius: float) -> Geometry:
+    return water_geometry(radius_2=radius)
+
+
+def bend_geometry(thetas_in_deg: float) -> Geometry:
+    return water_geometry(thetas_in_deg=thetas_in_deg)
+
+
+# Scans of case (a), (b) and (c) in Fig 3 of https://arxiv.org/pdf/2104.10220.pdf
+WATER_SCANS = {
+    "a": MoleculeScan(name="water_case_a", geometry=symmetric_stretch_geometry, coordinates=radii),
+    "b": MoleculeScan(name="water_case_b", geometry=single_stretch_geometry, coordinates=radii),
+    "c": MoleculeScan(name="water_case_c", geometry=bend_geometry, coordinates=thetas),
+}
+
+
+class WaterMolecule(GenericMolecule):
     def __init__(self, radius_1: float = R_1, radius_2: float = R_2, thetas_in_deg: float = THETAS_IN_DEG):
         self.radius_1 = radius_1
         self.radius_2 = radius_2
         self.thetas_in_deg = thetas_in_deg
-        self.molecule = Molecule(
-            geometry=[
-                ("O", [0.0, 0.0, 0.0]),
-                ("H", [self.h1_x, 0.0, 0.0]),
-                ("H", [self.h2_x, self.h2_y, 0.0]),
-            ],
-            charge=0,
-            multiplicity=1,
-        )
-        self._problem = None
-        self._classical_result = None
+        super().__init__(water_geometry(radius_1, radius_2, thetas_in_deg), basis="sto6g")
 
     def __repr__(self):
         return f"WaterMolecule(radius_1={self.radius_1}, radius_2={self.radius_2}, thetas_in_deg={self.thetas_in_deg})"
 
-    def __str__(self):
-        return self.__repr__()
-
-    def _to_problem(self) -> ElectronicStructureProblem:
-        driver = PySCFDriver.from_molecule(molecule=self.molecule, basis="sto6g")
-        return ElectronicStructureProblem(driver)
-
-    def solve_classical_result(self):
-        if not self._classical_result:
-            self._classical_result = CLASSICAL_SOLVER.solve(self.problem)
-
     @property
     def h1_x(self):
         return self.radius_1
@@ -69,54 +74,11 @@ class WaterMolecule:
     def h2_y(self):
         return self.radius_2 * np.sin(np.pi / 180 * self.thetas_in_deg)
 
-    @property
-    def problem(self) -> ElectronicStructureProblem:
-        if self._problem is None:
-            self._problem = self._to_problem()
-        return self._problem
-
-    @property
-    def classical_result(self):
-        if not self._classical_result:
-            self.solve_classical_result()
-        return self._classical_result
-
-    @property
-    def hartree_fock_energy(self):
-        return self.classical_result.hartree_fock_energy
-
-    @property
-    def classical_energy(self):
-        return self.classical_result.total_energies[0]
-
 
 def create_water_data(case="b") -> ExperimentDataSet:
-    if case not in ["a", "b", "c"]:
+    if case not in WATER_SCANS:
         raise ValueError("Case must be 'a', 'b', or 'c'.")
-    water_data = ExperimentDataSet()
-
-    if case in {"a", "b"}:
-        params = radii(50)
-    elif case == "c":
-        params = thetas(50)
-
-    for p in params:
-        if case == "a":
-            water = WaterMolecule(radius_1=p, radius_2=p)
-        if case == "b":
-            water = WaterMolecule(radius_2=p)
-        if case == "c":
-            water = WaterMolecule(thetas_in_deg=p)
-        classical_energy = water.classical_energy
-        print("Classical energy = ", classical_energy)
-        water_data.add_data_point(
-            DataPoint(
-                radius=p,
-                hartree_fock_energy=water.hartree_fock_energy,
-                classical_energy=classical_energy,
-            )
-        )
-    return water_data
+    return WATER_SCANS[case].classical_data(50)
 
 
 if __name__ == "__main__":
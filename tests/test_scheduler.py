@@ -0,0 +1,78 @@
+"""
+Tests of the memory-bounded scheduler with synthetic allocation tasks.
+The tasks are module-level functions so that the spawned workers can import them.
+"""
+import os
+import time
+
+from entanglement_simulation.utils.scheduler import MemoryBoundedScheduler, Task
+
+MIB = 2 ** 20
+
+
+def allocate(mib: int, seconds: float = 0.5) -> tuple:
+    """Allocates `mib` MiB step by step and returns the start and end time of the task."""
+    start = time.time()
+    chunks = []
+    for _ in range(5):
+        chunks.append(b"\x01" * (mib * MIB // 5))
+        time.sleep(seconds / 5)
+    return start, time.time()
+
+
+def allocate_per_thread(mib_per_thread: int) -> int:
+    """Allocates more memory the more threads the task is given, and returns its number of threads."""
+    threads = int(os.environ["OMP_NUM_THREADS"])
+    allocate(mib_per_thread * threads)
+    return threads
+
+
+def exit_with_code_3():
+    os._exit(3)
+
+
+def raise_error():
+    raise RuntimeError("bad task")
+
+
+def test_default_per_task_limit_shares_the_budget():
+    scheduler = MemoryBoundedScheduler(memory_budget=800 * MIB, max_workers=4)
+    assert scheduler.per_task_limit == 200 * MIB
+
+
+def test_admission_keeps_reserved_memory_within_budget():
+    scheduler = MemoryBoundedScheduler(
+        memory_budget=300 * MIB, per_task_limit=150 * MIB, max_workers=4, threads_per_task=1, poll_interval=0.05
+    )
+    results = scheduler.run([Task(allocate, args=(100,)) for _ in range(5)])
+
+    assert all(r.succeeded and r.attempts == 1 for r in results)
+    # At most two tasks fit the budget: never more than two may run at the same time.
+    intervals = [r.result for r in results]
+    for start, _ in intervals:
+        assert sum(s <= start < e for s, e in intervals) <= 2
+
+
+def test_task_over_limit_is_restarted_with_fewer_threads():
+    scheduler = MemoryBoundedScheduler(
+        memory_budget=600 * MIB, per_task_limit=150 * MIB, max_workers=1, threads_per_task=4, poll_interval=0.05
+    )
+    result, = scheduler.run([Task(allocate_per_thread, args=(60,))])
+
+    assert result.succeeded
+    assert result.result == 2
+    assert result.threads == 2
+    assert result.attempts == 2
+
+
+def test_failing_tasks_are_recorded_without_retry():
+    scheduler = MemoryBoundedScheduler(
+        memory_budget=600 * MIB, max_workers=2, threads_per_task=2, poll_interval=0.05
+    )
+    exited, raised, succeeded = scheduler.run(
+        [Task(exit_with_code_3), Task(raise_error), Task(allocate, args=(10, 0.1))]
+    )
+
+    assert not exited.succeeded and "exit code 3" in exited.error and exited.attempts == 1
+    assert not raised.succeeded and "RuntimeError: bad task" in raised.error and raised.attempts == 1
+    assert succeeded.succeeded